@@ -6,10 +6,226 @@ This module provides tools to analyze sales and inventory data at a corporate le
 - Pivot Table creation for multi-dimensional data aggregation
 """
 
+from contextlib import nullcontext
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; the pandas engine is always available
+    pl = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Without pyarrow, frames keep numpy-backed dtypes
+    pa = None
+
+
+# The lazy Polars paths need LazyFrame.pivot and collect(engine=...), which
+# older Polars releases lack; there, Polars inputs are handed to pandas instead
+POLARS_LAZY_QUERIES = pl is not None and hasattr(pl.LazyFrame, 'pivot')
+
+# Aggregations supported by the Polars pivot path of create_pivot_table
+POLARS_PIVOT_AGGREGATIONS = ('sum', 'mean', 'count')
+
+# Aggregations whose pivot margins create_pivot_table derives from the cells
+MARGIN_AGGREGATIONS = ('sum', 'mean', 'count')
+
+# Cumulative share (in percent) that marks the "vital few" in a Pareto analysis
+PARETO_THRESHOLD = 80.0
+
+# Rows per chunk when streaming a CSV through load_data
+DEFAULT_CHUNKSIZE = 256 * 1024
+
+# pd.read_csv options; Arrow-backed columns group and sum faster
+READ_CSV_OPTIONS = {'dtype_backend': 'pyarrow'} if pa is not None else {}
+
+# Arrow-backed dtypes for the sample data generators
+SALES_ARROW_DTYPES = {
+    'Product': 'string[pyarrow]',
+    'Region': 'string[pyarrow]',
+    'Quarter': 'string[pyarrow]',
+    'Sales': 'float64[pyarrow]',
+}
+INVENTORY_ARROW_DTYPES = {
+    'Item': 'string[pyarrow]',
+    'Category': 'string[pyarrow]',
+    'Turnover': 'float64[pyarrow]',
+}
+
+# Pareto charts with more bars than this fold their tail into an "Other" bar
+MAX_PARETO_BARS = 500
+OTHER_BAR_THRESHOLD = 95.0
+
+# Matplotlib settings for charts that are only saved to disk
+FAST_RENDER_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+# (figure, bar axes, cumulative axes) shared by reuse_figure renders
+_REUSABLE_FIGURE = None
+
+
+def _is_polars_frame(data) -> bool:
+    """Return True for Polars DataFrame/LazyFrame inputs."""
+    return pl is not None and isinstance(data, (pl.DataFrame, pl.LazyFrame))
+
+
+def _polars_engine(streaming: bool) -> str:
+    """Polars collect engine for the `streaming` flag."""
+    return 'streaming' if streaming else 'in-memory'
+
+
+def _polars_to_pandas(data, streaming: bool = False) -> pd.DataFrame:
+    """Collect a Polars DataFrame/LazyFrame into a pandas DataFrame."""
+    lazy = data.lazy()
+    if POLARS_LAZY_QUERIES:
+        return lazy.collect(engine=_polars_engine(streaming)).to_pandas()
+    return lazy.collect().to_pandas()
+
+
+def _as_lazy_frame(data, columns: List[str]):
+    """Return a Polars LazyFrame over just `columns` of a pandas or Polars frame."""
+    if _is_polars_frame(data):
+        return data.lazy().select(columns)
+    return pl.from_pandas(data[columns], rechunk=True).lazy()
+
+
+def _categorize_low_cardinality(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return `data` with string columns that have fewer unique values than half
+    the row count converted to Categorical. Other columns are shared, not copied.
+    """
+    string_columns = data.select_dtypes(include=['object', 'string']).columns
+    conversions = {
+        column: 'category'
+        for column in string_columns
+        if data[column].nunique() < len(data) // 2
+    }
+    if not conversions:
+        return data
+    return data.astype(conversions)
+
+
+def _to_dense(values) -> np.ndarray:
+    """
+    Return the values of a pandas object as a plain numpy array. Extension
+    (e.g. Arrow-backed) results come back as float64 with NaN for missing.
+    """
+    array = values.to_numpy()
+    if array.dtype == object:
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return array
+
+
+def _pareto_kernel(values, total, threshold):
+    """
+    Cumulative sum and percentage of `values` against `total` in one pass,
+    plus the index of the first entry whose percentage exceeds `threshold`
+    (len(values) if none does). Compiled with Numba by _get_pareto_kernel.
+    """
+    n = values.size
+    scale = 100.0 / total
+    cumulative_sum = np.cumsum(values)
+    cumulative_percentage = np.empty(n)
+    crossing = n
+    for i in range(n):
+        cumulative_percentage[i] = cumulative_sum[i] * scale
+        if crossing == n and cumulative_percentage[i] > threshold:
+            crossing = i
+    return cumulative_sum, cumulative_percentage, crossing
+
+
+# Compiled _pareto_kernel; False once Numba is known to be unavailable
+_COMPILED_PARETO_KERNEL = None
+
+
+def _get_pareto_kernel():
+    """Import Numba on first use and return the compiled kernel, or None."""
+    global _COMPILED_PARETO_KERNEL
+    if _COMPILED_PARETO_KERNEL is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _COMPILED_PARETO_KERNEL = False
+        else:
+            # NumPy error model: a zero total gives NaN percentages instead of raising
+            _COMPILED_PARETO_KERNEL = njit(cache=True, error_model='numpy')(_pareto_kernel)
+    return _COMPILED_PARETO_KERNEL or None
+
+
+def _cumulative_pareto(values: np.ndarray, total: float, threshold: float):
+    """
+    Return (cumulative_sum, cumulative_percentage, crossing) for values
+    sorted in descending order, where crossing is the first index above
+    threshold. Uses the Numba kernel when available, NumPy otherwise; both
+    keep the dtype of integer values for the cumulative sum and give NaN
+    percentages when the total is zero.
+    """
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind not in 'iuf':
+        values = values.astype(np.float64)
+    total = np.float64(total)
+    kernel = _get_pareto_kernel()
+    if kernel is not None:
+        cumulative_sum, cumulative_percentage, crossing = kernel(values, total, float(threshold))
+        # Numba widens small unsigned sums to int64; match np.cumsum's dtype
+        cumulative_sum = cumulative_sum.astype(np.cumsum(values[:0]).dtype, copy=False)
+        return cumulative_sum, cumulative_percentage, crossing
+    cumulative_sum = np.cumsum(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cumulative_percentage = cumulative_sum * (100.0 / total)
+    crossing = int(np.searchsorted(cumulative_percentage, threshold, side='right'))
+    return cumulative_sum, cumulative_percentage, crossing
+
+
+def _descending_key(values: np.ndarray) -> np.ndarray:
+    """
+    Return a sort key whose ascending order is the descending order of
+    `values`. Integers use bitwise NOT, which unlike negation cannot wrap
+    around on unsigned dtypes; floats are negated so NaN still sorts last.
+    """
+    if values.dtype.kind in 'iub':
+        return ~values
+    return -values
+
+
+def _pareto_top_k(values: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Return the indices of the largest values in descending order, up to and
+    including the first one that takes the cumulative share past threshold.
+    
+    Candidates are selected with np.argpartition and only those are sorted;
+    the candidate count doubles until the threshold is crossed.
+    """
+    n = len(values)
+    total = values.sum()
+    key = _descending_key(values)
+    k = max(32, int(0.3 * n))
+    while k < n:
+        candidates = np.argpartition(key, k)[:k]
+        order = candidates[np.argsort(key[candidates], kind='stable')]
+        _, _, head = _cumulative_pareto(values[order], total, threshold)
+        if head < k:
+            return order[:head + 1]
+        k *= 2
+    order = np.argsort(key, kind='stable')
+    _, _, head = _cumulative_pareto(values[order], total, threshold)
+    return order[:head + 1]
+
+
+def _get_reusable_fig():
+    """Return the shared Pareto figure and axes, creating it if it was closed."""
+    global _REUSABLE_FIGURE
+    if _REUSABLE_FIGURE is None or not plt.fignum_exists(_REUSABLE_FIGURE[0].number):
+        fig, ax1 = plt.subplots(figsize=(12, 6))
+        _REUSABLE_FIGURE = (fig, ax1, ax1.twinx())
+    return _REUSABLE_FIGURE
 
 
 class DataScientist:
@@ -26,26 +242,70 @@ class DataScientist:
         """Initialize the DataScientist tool."""
         self.data = None
         
-    def load_data(self, data: Union[pd.DataFrame, str, Dict]) -> pd.DataFrame:
+    def load_data(
+        self,
+        data: Union[pd.DataFrame, str, Dict],
+        chunksize: Optional[int] = None,
+        streaming_agg: Optional[Tuple[str, str]] = None,
+        auto_categorize: bool = True
+    ) -> Union[pd.DataFrame, pd.Series]:
         """
         Load data from various sources.
         
         Args:
-            data: Can be a DataFrame, file path (CSV), or dictionary
+            data: Can be a DataFrame, file path (CSV), dictionary, or a
+                Polars DataFrame/LazyFrame
+            chunksize: Read a CSV file in chunks of this many rows
+            streaming_agg: Optional (category_column, value_column) pair. For
+                CSV files, sums value_column per category chunk by chunk so
+                the full file is never held in memory. The pre-aggregated
+                Series is stored instead of the raw rows and is picked up
+                directly by create_pareto_chart.
+            auto_categorize: Convert low-cardinality string columns of a
+                pandas DataFrame to Categorical once, so later group-bys
+                and pivots on them work on integer codes. The caller's
+                DataFrame is not modified.
             
         Returns:
-            pd.DataFrame: Loaded data
+            pd.DataFrame: Loaded data (pd.Series when streaming_agg is used)
         """
-        if isinstance(data, pd.DataFrame):
+        if streaming_agg is not None and not isinstance(data, str):
+            raise ValueError("streaming_agg requires a CSV file path")
+            
+        if isinstance(data, pd.DataFrame) or _is_polars_frame(data):
+            # Polars frames are kept as-is so queries on them stay lazy
             self.data = data
         elif isinstance(data, str):
             # Assume it's a file path
-            self.data = pd.read_csv(data)
+            if streaming_agg is not None:
+                category_column, value_column = streaming_agg
+                aggregated = pd.Series(dtype=float)
+                for chunk in pd.read_csv(
+                    data,
+                    chunksize=chunksize or DEFAULT_CHUNKSIZE,
+                    usecols=[category_column, value_column],
+                    **READ_CSV_OPTIONS
+                ):
+                    aggregated = aggregated.add(
+                        chunk.groupby(category_column)[value_column].sum(), fill_value=0
+                    )
+                aggregated.index.name = category_column
+                aggregated.name = value_column
+                self.data = aggregated
+            elif chunksize is not None:
+                self.data = pd.concat(
+                    pd.read_csv(data, chunksize=chunksize, **READ_CSV_OPTIONS), ignore_index=True
+                )
+            else:
+                self.data = pd.read_csv(data, **READ_CSV_OPTIONS)
         elif isinstance(data, dict):
             self.data = pd.DataFrame(data)
         else:
             raise ValueError("Data must be a DataFrame, file path, or dictionary")
             
+        if auto_categorize and isinstance(self.data, pd.DataFrame):
+            self.data = _categorize_low_cardinality(self.data)
+            
         return self.data
     
     def create_pareto_chart(
@@ -55,7 +315,11 @@ class DataScientist:
         value_column: str = None,
         title: str = "Pareto Chart",
         save_path: Optional[str] = None,
-        show_plot: bool = True
+        show_plot: bool = True,
+        engine: str = 'pandas',
+        reuse_figure: bool = False,
+        top_k_only: bool = False,
+        streaming: bool = False
     ) -> tuple:
         """
         Create a Pareto chart to identify the vital few from the trivial many.
@@ -64,15 +328,37 @@ class DataScientist:
         contribute the most to the total value.
         
         Args:
-            data: DataFrame to analyze (uses self.data if None)
+            data: DataFrame to analyze (uses self.data if None). A Series
+                already aggregated per category (see load_data's
+                streaming_agg) is sorted directly without a group-by, and
+                Polars DataFrame/LazyFrame inputs always use the Polars engine
+                (or are converted to pandas on Polars releases too old for it).
             category_column: Column name for categories
             value_column: Column name for values to analyze
             title: Chart title
             save_path: Optional path to save the chart
             show_plot: Whether to display the plot
+            engine: Aggregation engine, 'pandas' or 'polars'. The Polars engine
+                fuses the group-by, sort and cumulative sum into a single
+                multi-threaded lazy query; it falls back to pandas when Polars
+                is not installed or predates LazyFrame.pivot.
+            reuse_figure: Draw into a shared module-level figure instead of
+                allocating a new one (ignored when show_plot is True). Useful
+                when saving many charts in a batch; the figure stays open
+                until the caller closes it with plt.close(fig).
+            top_k_only: Only return (and chart) the leading categories up to
+                and including the first one past the 80% threshold. Avoids a
+                full sort when there are many categories; the total number of
+                categories is kept in result_df.attrs['total_categories'].
+            streaming: Run the Polars query on the streaming engine, which
+                processes the data in batches and caps peak memory for inputs
+                larger than RAM. It may give up some sort optimizations, and
+                it has no effect on the pandas engine.
             
         Returns:
-            tuple: (DataFrame with Pareto analysis, matplotlib figure)
+            tuple: (DataFrame with Pareto analysis, matplotlib figure). The
+                figure is None when show_plot is False and no save_path is
+                given, since no chart is drawn in that case.
         """
         if data is None:
             data = self.data
@@ -80,31 +366,143 @@ class DataScientist:
         if data is None:
             raise ValueError("No data available. Please load data first.")
             
+        if isinstance(data, pd.Series):
+            category_column = category_column or data.index.name
+            value_column = value_column or data.name
+            
         if category_column is None or value_column is None:
             raise ValueError("Both category_column and value_column must be specified")
+            
+        if engine not in ('pandas', 'polars'):
+            raise ValueError("engine must be 'pandas' or 'polars'")
         
-        # Aggregate data by category
-        pareto_data = data.groupby(category_column)[value_column].sum().sort_values(ascending=False)
+        if _is_polars_frame(data) and not POLARS_LAZY_QUERIES:
+            data = _polars_to_pandas(data)
         
-        # Calculate cumulative percentage
-        cumulative_sum = pareto_data.cumsum()
-        cumulative_percentage = (cumulative_sum / pareto_data.sum()) * 100
+        if _is_polars_frame(data) or (engine == 'polars' and POLARS_LAZY_QUERIES
+                                      and not isinstance(data, pd.Series)):
+            # Aggregate, sort and accumulate in one lazy Polars query
+            value = pl.col(value_column)
+            pareto_frame = (
+                _as_lazy_frame(data, [category_column, value_column])
+                .drop_nulls(category_column)
+                .group_by(category_column)
+                .agg(value.sum())
+                .sort(value_column, descending=True)
+                .with_columns(
+                    value.cum_sum().alias('Cumulative_Value'),
+                    (value.cum_sum() / value.sum() * 100).alias('Cumulative_Percentage')
+                )
+                .collect(engine=_polars_engine(streaming))
+            )
+            categories = pareto_frame[category_column].to_numpy()
+            pareto_values = pareto_frame[value_column].to_numpy()
+            cumulative_sum = pareto_frame['Cumulative_Value'].to_numpy()
+            cumulative_percentage = pareto_frame['Cumulative_Percentage'].to_numpy()
+            n_categories = len(pareto_frame)
+            if top_k_only:
+                head = int(np.searchsorted(cumulative_percentage, PARETO_THRESHOLD, side='right')) + 1
+                categories, pareto_values = categories[:head], pareto_values[:head]
+                cumulative_sum, cumulative_percentage = cumulative_sum[:head], cumulative_percentage[:head]
+        else:
+            if isinstance(data, pd.Series):
+                # Already aggregated per category by load_data
+                aggregated = data
+            else:
+                # Aggregate data by category; ordering is done once below
+                aggregated = data.groupby(category_column, sort=False, observed=True)[value_column].sum()
+            n_categories = len(aggregated)
+            totals = aggregated.to_numpy()
+            
+            if top_k_only:
+                # Only rank the categories needed to cross the threshold
+                order = _pareto_top_k(totals, PARETO_THRESHOLD)
+            else:
+                order = np.argsort(_descending_key(totals), kind='stable')
+            categories = aggregated.index.to_numpy()[order]
+            pareto_values = totals[order]
+            grand_total = totals.sum()
+            
+            # Calculate cumulative percentage in one pass over the raw values
+            cumulative_sum, cumulative_percentage, _ = _cumulative_pareto(
+                pareto_values, grand_total, PARETO_THRESHOLD
+            )
         
-        # Create the plot
-        fig, ax1 = plt.subplots(figsize=(12, 6))
+        # Create result DataFrame
+        result_df = pd.DataFrame({
+            'Category': categories,
+            'Value': pareto_values,
+            'Cumulative_Value': cumulative_sum,
+            'Cumulative_Percentage': cumulative_percentage
+        })
+        result_df.attrs['total_categories'] = n_categories
+        
+        if not show_plot and save_path is None:
+            # Only the table was asked for; skip building a figure entirely
+            return result_df, None
+        
+        # Nothing is displayed when only saving, so favour rendering speed
+        if save_path and not show_plot:
+            render_context = plt.rc_context(FAST_RENDER_RC)
+        else:
+            render_context = nullcontext()
+        with render_context:
+            fig = self._plot_pareto(
+                categories, pareto_values, cumulative_percentage,
+                value_column, title, save_path, show_plot,
+                reuse_figure=reuse_figure and not show_plot
+            )
+        
+        return result_df, fig
+    
+    def _plot_pareto(
+        self,
+        categories: np.ndarray,
+        pareto_values: np.ndarray,
+        cumulative_percentage: np.ndarray,
+        value_column: str,
+        title: str,
+        save_path: Optional[str],
+        show_plot: bool,
+        reuse_figure: bool = False
+    ):
+        """
+        Draw the Pareto bar and cumulative line chart.
+        
+        With more than MAX_PARETO_BARS categories, the tail beyond
+        OTHER_BAR_THRESHOLD percent is drawn as a single "Other" bar.
+        With reuse_figure, the shared figure from _get_reusable_fig is
+        cleared and redrawn, and left open for the next call.
+        """
+        if len(pareto_values) > MAX_PARETO_BARS:
+            head = int(np.searchsorted(cumulative_percentage, OTHER_BAR_THRESHOLD, side='right')) + 1
+            head = min(head, MAX_PARETO_BARS - 1)
+            categories = np.append(categories[:head].astype(object), 'Other')
+            pareto_values = np.append(pareto_values[:head], pareto_values[head:].sum())
+            cumulative_percentage = np.append(cumulative_percentage[:head], cumulative_percentage[-1])
+        
+        # Create the plot, or clear the shared one
+        if reuse_figure:
+            fig, ax1, ax2 = _get_reusable_fig()
+            ax1.clear()
+            ax2.clear()
+            ax2.yaxis.tick_right()
+            ax2.yaxis.set_label_position('right')
+        else:
+            fig, ax1 = plt.subplots(figsize=(12, 6))
+            ax2 = ax1.twinx()
         
         # Bar chart for values
-        x_pos = np.arange(len(pareto_data))
-        ax1.bar(x_pos, pareto_data.values, color='steelblue', alpha=0.7)
+        x_pos = np.arange(len(pareto_values))
+        ax1.bar(x_pos, pareto_values, color='steelblue', alpha=0.7)
         ax1.set_xlabel('Categories', fontsize=12)
         ax1.set_ylabel(f'{value_column}', fontsize=12, color='steelblue')
         ax1.tick_params(axis='y', labelcolor='steelblue')
         ax1.set_xticks(x_pos)
-        ax1.set_xticklabels(pareto_data.index, rotation=45, ha='right')
+        ax1.set_xticklabels(categories, rotation=45, ha='right')
         
         # Line chart for cumulative percentage
-        ax2 = ax1.twinx()
-        ax2.plot(x_pos, cumulative_percentage.values, color='red', marker='o', linewidth=2)
+        ax2.plot(x_pos, cumulative_percentage, color='red', marker='o', linewidth=2)
         ax2.set_ylabel('Cumulative Percentage (%)', fontsize=12, color='red')
         ax2.tick_params(axis='y', labelcolor='red')
         ax2.axhline(y=80, color='green', linestyle='--', linewidth=1, label='80% threshold')
@@ -112,30 +510,22 @@ class DataScientist:
         ax2.legend(loc='lower right')
         
         # Title and grid
-        plt.title(title, fontsize=14, fontweight='bold')
+        ax2.set_title(title, fontsize=14, fontweight='bold')
         ax1.grid(axis='y', alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save if path provided
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=300, bbox_inches='tight')
             
         if show_plot:
             plt.show()
-        else:
+        elif not reuse_figure:
             # Close figure to prevent memory leak when not showing
             plt.close(fig)
-        
-        # Create result DataFrame
-        result_df = pd.DataFrame({
-            'Category': pareto_data.index,
-            'Value': pareto_data.values,
-            'Cumulative_Value': cumulative_sum.values,
-            'Cumulative_Percentage': cumulative_percentage.values
-        })
-        
-        return result_df, fig
+            
+        return fig
     
     def create_pivot_table(
         self,
@@ -146,13 +536,17 @@ class DataScientist:
         aggfunc: Union[str, Dict] = 'sum',
         fill_value: Optional[float] = None,
         margins: bool = False,
-        margins_name: str = 'Total'
+        margins_name: str = 'Total',
+        column_values: Optional[List] = None,
+        round_to: Optional[int] = None,
+        streaming: bool = False
     ) -> pd.DataFrame:
         """
         Create a pivot table for multi-dimensional data analysis.
         
         Args:
-            data: DataFrame to analyze (uses self.data if None)
+            data: DataFrame to analyze (uses self.data if None). Polars
+                inputs are pivoted with Polars where the shape allows it.
             index: Column(s) to use as row index
             columns: Column(s) to use as column headers
             values: Column(s) to aggregate
@@ -160,6 +554,14 @@ class DataScientist:
             fill_value: Value to replace NaN
             margins: Add row/column totals
             margins_name: Name for the totals row/column
+            column_values: Optional list of column header values to keep. When
+                given (and Polars is installed) the pivot runs as a Polars lazy
+                query that only aggregates these columns.
+            round_to: Round the aggregated cells (and totals) to this many
+                decimals. On the Polars path the rounding is part of the
+                aggregation expression.
+            streaming: Run Polars pivots on the streaming engine to cap peak
+                memory (see create_pareto_chart)
             
         Returns:
             pd.DataFrame: Pivot table
@@ -173,17 +575,198 @@ class DataScientist:
         if index is None:
             raise ValueError("Index must be specified")
         
-        pivot = pd.pivot_table(
-            data,
-            index=index,
-            columns=columns,
-            values=values,
-            aggfunc=aggfunc,
-            fill_value=fill_value,
-            margins=margins,
-            margins_name=margins_name
+        polars_pivot = (POLARS_LAZY_QUERIES
+                        and all(isinstance(c, str) for c in (index, columns, values))
+                        and aggfunc in POLARS_PIVOT_AGGREGATIONS)
+        
+        if _is_polars_frame(data):
+            if polars_pivot:
+                if column_values is None:
+                    column_values = (
+                        data.lazy().select(pl.col(columns).drop_nulls().unique().sort())
+                        .collect(engine=_polars_engine(streaming))[columns].to_list()
+                    )
+                return self._create_polars_pivot(
+                    data, index, columns, values, aggfunc,
+                    column_values, fill_value, margins, margins_name, round_to, streaming
+                )
+            data = _polars_to_pandas(data, streaming)
+        
+        if column_values is not None:
+            if polars_pivot:
+                return self._create_polars_pivot(
+                    data, index, columns, values, aggfunc,
+                    column_values, fill_value, margins, margins_name, round_to, streaming
+                )
+            # Restrict the source rows so the pandas result matches
+            data = data[data[columns].isin(column_values)]
+        
+        if (margins and aggfunc in MARGIN_AGGREGATIONS
+                and all(isinstance(c, str) for c in (index, columns, values))):
+            # Derive the totals from the aggregated cells instead of letting
+            # pandas re-aggregate the source rows for its margins
+            pivot = self._pivot_with_margins(data, index, columns, values, aggfunc, margins_name)
+            if fill_value is not None:
+                pivot = pivot.fillna(fill_value)
+        else:
+            pivot = pd.pivot_table(
+                data,
+                index=index,
+                columns=columns,
+                values=values,
+                aggfunc=aggfunc,
+                fill_value=fill_value,
+                margins=margins,
+                margins_name=margins_name
+            )
+        
+        if round_to is not None:
+            pivot = pivot.round(round_to)
+        
+        return pivot
+    
+    def _pivot_with_margins(
+        self,
+        data: pd.DataFrame,
+        index: str,
+        columns: str,
+        values: str,
+        aggfunc: str,
+        margins_name: str
+    ) -> pd.DataFrame:
+        """
+        Pivot with row and column totals computed from the grouped cells.
+        
+        Sums and counts add up directly. Means are built from per-cell sums
+        and counts so the totals are true means over the source rows.
+        """
+        if aggfunc == 'mean':
+            grouped = (
+                data.groupby([index, columns], observed=True)[values]
+                .agg(['sum', 'count'])
+                .unstack(columns)
+            )
+            sums, counts = grouped['sum'], grouped['count']
+            pivot = sums / counts
+            row_totals = sums.sum(axis=1) / counts.sum(axis=1)
+            column_totals = sums.sum(axis=0) / counts.sum(axis=0)
+            grand_total = np.nansum(_to_dense(sums)) / np.nansum(_to_dense(counts))
+        else:
+            pivot = pd.pivot_table(data, index=index, columns=columns, values=values, aggfunc=aggfunc)
+            row_totals = pivot.sum(axis=1)
+            column_totals = pivot.sum(axis=0)
+            grand_total = column_totals.sum()
+            if aggfunc == 'count' or pd.api.types.is_integer_dtype(data[values]) \
+                    or pd.api.types.is_bool_dtype(data[values]):
+                # Missing cells make the cells float, but the totals stay
+                # integral, as in pd.pivot_table
+                row_totals = row_totals.astype('int64')
+                grand_total = int(grand_total)
+        
+        # Keep each column's dtype; the totals row is cast to match it
+        result = pivot.copy()
+        result.columns = pd.Index(list(pivot.columns), name=columns)
+        result[margins_name] = row_totals
+        totals_row = pd.DataFrame(
+            [list(column_totals) + [grand_total]],
+            index=[margins_name],
+            columns=result.columns
+        ).astype(result.dtypes.to_dict())
+        result = pd.concat([result, totals_row])
+        result.index = pd.Index(list(result.index), name=index)
+        return result
+    
+    def _create_polars_pivot(
+        self,
+        data,
+        index: str,
+        columns: str,
+        values: str,
+        aggfunc: str,
+        column_values: List,
+        fill_value: Optional[float],
+        margins: bool,
+        margins_name: str,
+        round_to: Optional[int] = None,
+        streaming: bool = False
+    ) -> pd.DataFrame:
+        """
+        Build a single-index pivot table with a Polars lazy query.
+        
+        Only the requested column values are aggregated. Margins are computed
+        from the same filtered LazyFrame so means stay exact. Cells and column
+        values without source rows are treated as pd.pivot_table treats them.
+        """
+        lazy = _as_lazy_frame(data, [index, columns, values]).drop_nulls([index, columns])
+        # Match the requested values in the column's own dtype, then pivot on
+        # its String form so each value maps to a known output column name
+        # (e.g. True -> "true")
+        requested = pl.Series(
+            columns, column_values, dtype=lazy.collect_schema()[columns], strict=False
+        )
+        labels = {
+            name: label
+            for name, label in zip(requested.cast(pl.String).to_list(), column_values)
+            if name is not None
+        }
+        names = list(labels)
+        lazy = lazy.filter(pl.col(columns).is_in(requested.drop_nulls()))
+        lazy = lazy.with_columns(pl.col(columns).cast(pl.String))
+        value = getattr(pl.col(values), aggfunc)()
+        cell = getattr(pl.element(), aggfunc)()
+        if round_to is not None:
+            # Round inside the aggregation rather than over the result
+            value = value.round(round_to)
+            cell = cell.round(round_to)
+        pivots = [
+            lazy.pivot(
+                on=columns,
+                on_columns=names,
+                index=index,
+                values=values,
+                aggregate_function=function
+            ).sort(index)
+            for function in (cell, pl.element().len())
+        ]
+        queries = list(pivots)
+        if margins:
+            queries += [
+                lazy.group_by(index).agg(value),
+                lazy.group_by(columns).agg(value),
+                lazy.select(value),
+            ]
+        frames = pl.collect_all(queries, engine=_polars_engine(streaming))
+        
+        body, counts = frames[:2]
+        # Polars fills cells without source rows with 0 for sum and count;
+        # mask them so they are missing, as in pd.pivot_table, and drop
+        # requested column values that have no rows at all
+        present = [name for name in names if counts[name].fill_null(0).sum() > 0]
+        pivot = pd.DataFrame(
+            {
+                labels[name]: np.where(counts[name].fill_null(0).to_numpy() > 0,
+                                       body[name].cast(pl.Float64).to_numpy(), np.nan)
+                for name in present
+            },
+            index=pd.Index(body[index].to_numpy(), name=index)
         )
+        pivot.columns.name = columns
         
+        if margins:
+            row_totals, column_totals, grand_total = frames[2:]
+            pivot[margins_name] = pd.Series(
+                row_totals[values].to_numpy(), index=row_totals[index].to_numpy()
+            )
+            totals = pd.Series(
+                column_totals[values].to_numpy(), index=column_totals[columns].to_numpy()
+            ).reindex(present)
+            totals.index = [labels[name] for name in present]
+            totals[margins_name] = grand_total[values][0]
+            pivot.loc[margins_name] = totals.to_numpy()
+        
+        if fill_value is not None:
+            pivot = pivot.fillna(fill_value)
+            
         return pivot
     
     def analyze_sales_by_product(
@@ -191,7 +774,11 @@ class DataScientist:
         sales_data: pd.DataFrame,
         product_column: str = 'Product',
         sales_column: str = 'Sales',
-        save_chart: Optional[str] = None
+        save_chart: Optional[str] = None,
+        reuse_figure: bool = False,
+        top_k_only: bool = False,
+        engine: str = 'pandas',
+        streaming: bool = False
     ) -> Dict:
         """
         Analyze sales data to identify top-performing products using Pareto analysis.
@@ -201,32 +788,45 @@ class DataScientist:
             product_column: Column name for products
             sales_column: Column name for sales values
             save_chart: Optional path to save the Pareto chart
+            reuse_figure: Render into the shared Pareto figure (see
+                create_pareto_chart)
+            top_k_only: Only rank the categories up to the 80% threshold;
+                pareto_data then holds just those leading rows
+            engine: Aggregation engine, 'pandas' or 'polars'
+            streaming: Use the Polars streaming engine (see create_pareto_chart)
             
         Returns:
             dict: Analysis results including Pareto data and insights
         """
-        self.load_data(sales_data)
-        
-        # Create Pareto chart
+        # Pass the frame straight through so self.data (and anything
+        # precomputed on it by load_data) is left untouched
         pareto_df, fig = self.create_pareto_chart(
+            data=sales_data,
             category_column=product_column,
             value_column=sales_column,
             title=f"Sales Pareto Analysis by {product_column}",
             save_path=save_chart,
-            show_plot=False
+            show_plot=False,
+            reuse_figure=reuse_figure,
+            top_k_only=top_k_only,
+            engine=engine,
+            streaming=streaming
         )
         
-        # Identify products contributing to 80% of sales
-        products_80_percent = pareto_df[pareto_df['Cumulative_Percentage'] <= 80]
+        # Identify products contributing to 80% of sales. Cumulative percentage
+        # is monotone, so the cut-off is a binary search rather than a mask.
+        cutoff = int(np.searchsorted(pareto_df['Cumulative_Percentage'].to_numpy(), PARETO_THRESHOLD, side='right'))
+        products_80_percent = pareto_df.iloc[:cutoff]
+        total_products = pareto_df.attrs['total_categories']
         
         analysis = {
             'pareto_data': pareto_df,
-            'total_products': len(pareto_df),
+            'total_products': total_products,
             'products_contributing_80_percent': len(products_80_percent),
             'top_products': products_80_percent,
             'percentage_of_products_for_80_sales': 
-                (len(products_80_percent) / len(pareto_df)) * 100,
-            'figure': fig
+                (len(products_80_percent) / total_products) * 100,
+            'figure': fig  # None unless save_chart was given
         }
         
         return analysis
@@ -236,7 +836,11 @@ class DataScientist:
         inventory_data: pd.DataFrame,
         item_column: str = 'Item',
         turnover_column: str = 'Turnover',
-        save_chart: Optional[str] = None
+        save_chart: Optional[str] = None,
+        reuse_figure: bool = False,
+        top_k_only: bool = False,
+        engine: str = 'pandas',
+        streaming: bool = False
     ) -> Dict:
         """
         Analyze inventory turnover to identify slow-moving and fast-moving items.
@@ -246,31 +850,42 @@ class DataScientist:
             item_column: Column name for inventory items
             turnover_column: Column name for turnover rate
             save_chart: Optional path to save the Pareto chart
+            reuse_figure: Render into the shared Pareto figure (see
+                create_pareto_chart)
+            top_k_only: Only rank the categories up to the 80% threshold;
+                pareto_data then holds just those leading rows
+            engine: Aggregation engine, 'pandas' or 'polars'
+            streaming: Use the Polars streaming engine (see create_pareto_chart)
             
         Returns:
             dict: Analysis results including Pareto data and insights
         """
-        self.load_data(inventory_data)
-        
         # Create Pareto chart
         pareto_df, fig = self.create_pareto_chart(
+            data=inventory_data,
             category_column=item_column,
             value_column=turnover_column,
             title=f"Inventory Turnover Pareto Analysis",
             save_path=save_chart,
-            show_plot=False
+            show_plot=False,
+            reuse_figure=reuse_figure,
+            top_k_only=top_k_only,
+            engine=engine,
+            streaming=streaming
         )
         
         # Identify fast-moving items (contributing to 80% of turnover)
-        fast_moving = pareto_df[pareto_df['Cumulative_Percentage'] <= 80]
+        cutoff = int(np.searchsorted(pareto_df['Cumulative_Percentage'].to_numpy(), PARETO_THRESHOLD, side='right'))
+        fast_moving = pareto_df.iloc[:cutoff]
+        total_items = pareto_df.attrs['total_categories']
         
         analysis = {
             'pareto_data': pareto_df,
-            'total_items': len(pareto_df),
+            'total_items': total_items,
             'fast_moving_items_count': len(fast_moving),
             'fast_moving_items': fast_moving,
-            'percentage_fast_moving': (len(fast_moving) / len(pareto_df)) * 100,
-            'figure': fig
+            'percentage_fast_moving': (len(fast_moving) / total_items) * 100,
+            'figure': fig  # None unless save_chart was given
         }
         
         return analysis
@@ -281,7 +896,9 @@ class DataScientist:
         row_dimension: str,
         column_dimension: Optional[str] = None,
         value_metric: str = 'Sales',
-        aggfunc: str = 'sum'
+        aggfunc: str = 'sum',
+        round_to: Optional[int] = None,
+        streaming: bool = False
     ) -> pd.DataFrame:
         """
         Create a pivot table for sales analysis across multiple dimensions.
@@ -292,35 +909,44 @@ class DataScientist:
             column_dimension: Dimension for columns (e.g., 'Quarter', 'Year')
             value_metric: Metric to aggregate (e.g., 'Sales', 'Quantity')
             aggfunc: Aggregation function ('sum', 'mean', 'count')
+            round_to: Optional number of decimals to round the results to
+            streaming: Use the Polars streaming engine for Polars inputs
             
         Returns:
             pd.DataFrame: Pivot table with sales analysis
         """
-        self.load_data(sales_data)
-        
         pivot = self.create_pivot_table(
+            data=sales_data,
             index=row_dimension,
             columns=column_dimension,
             values=value_metric,
             aggfunc=aggfunc,
             margins=True,
-            margins_name='Grand Total'
+            margins_name='Grand Total',
+            round_to=round_to,
+            streaming=streaming
         )
         
         return pivot
 
 
-def generate_sample_sales_data(n_records: int = 1000) -> pd.DataFrame:
+def generate_sample_sales_data(n_records: int = 1000, backend: str = 'pandas'):
     """
     Generate sample sales data for testing.
     
     Args:
         n_records: Number of records to generate
+        backend: 'pandas' for a DataFrame or 'polars' for a Polars LazyFrame
         
     Returns:
-        pd.DataFrame: Sample sales data
+        pd.DataFrame: Sample sales data (pl.LazyFrame for the polars backend)
     """
-    np.random.seed(42)
+    if backend not in ('pandas', 'polars'):
+        raise ValueError("backend must be 'pandas' or 'polars'")
+    if backend == 'polars' and pl is None:
+        raise ImportError("Polars is required for backend='polars'")
+        
+    rng = np.random.default_rng(42)
     
     products = ['Product_A', 'Product_B', 'Product_C', 'Product_D', 'Product_E',
                 'Product_F', 'Product_G', 'Product_H', 'Product_I', 'Product_J']
@@ -328,17 +954,22 @@ def generate_sample_sales_data(n_records: int = 1000) -> pd.DataFrame:
     quarters = ['Q1', 'Q2', 'Q3', 'Q4']
     
     # Create Pareto distribution (20% of products drive 80% of sales)
-    product_weights = [0.25, 0.20, 0.15, 0.10, 0.08, 0.07, 0.05, 0.04, 0.03, 0.03]
+    product_weights = np.array([0.25, 0.20, 0.15, 0.10, 0.08, 0.07, 0.05, 0.04, 0.03, 0.03])
     
+    # Draw integer indices once and gather, rather than sampling the labels
     data = {
-        'Product': np.random.choice(products, n_records, p=product_weights),
-        'Region': np.random.choice(regions, n_records),
-        'Quarter': np.random.choice(quarters, n_records),
-        'Sales': np.random.exponential(1000, n_records) + 100,
-        'Quantity': np.random.randint(1, 100, n_records),
-        'Date': pd.date_range('2023-01-01', periods=n_records, freq='D')
+        'Product': np.asarray(products)[rng.choice(len(products), n_records, p=product_weights)],
+        'Region': np.asarray(regions)[rng.integers(0, len(regions), n_records)],
+        'Quarter': np.asarray(quarters)[rng.integers(0, len(quarters), n_records)],
+        'Sales': rng.exponential(1000, n_records) + 100,
+        'Quantity': rng.integers(1, 100, n_records),
+        'Date': (np.datetime64('2023-01-01') + np.arange(n_records).astype('timedelta64[D]')).astype('datetime64[ns]')
     }
     
+    if backend == 'polars':
+        return pl.LazyFrame(data)
+    if pa is not None:
+        return pd.DataFrame(data).astype(SALES_ARROW_DTYPES)
     return pd.DataFrame(data)
 
 
@@ -352,24 +983,27 @@ def generate_sample_inventory_data(n_items: int = 50) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Sample inventory data
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Create items with varying turnover rates (Pareto distribution)
-    items = [f'Item_{i:03d}' for i in range(1, n_items + 1)]
+    item_numbers = np.arange(1, n_items + 1).astype('U10')
+    items = np.char.add('Item_', np.char.zfill(item_numbers, 3))
     categories = ['Electronics', 'Clothing', 'Food', 'Furniture', 'Books']
     
     # Simulate turnover with Pareto distribution
-    turnover = np.random.pareto(2, n_items) * 1000 + 50
+    turnover = rng.pareto(2, n_items) * 1000 + 50
     
     data = {
         'Item': items,
-        'Category': np.random.choice(categories, n_items),
+        'Category': np.asarray(categories)[rng.integers(0, len(categories), n_items)],
         'Turnover': turnover,
-        'Stock_Level': np.random.randint(10, 500, n_items),
-        'Reorder_Point': np.random.randint(5, 100, n_items),
-        'Unit_Cost': np.random.uniform(5, 500, n_items)
+        'Stock_Level': rng.integers(10, 500, n_items),
+        'Reorder_Point': rng.integers(5, 100, n_items),
+        'Unit_Cost': rng.uniform(5, 500, n_items)
     }
     
+    if pa is not None:
+        return pd.DataFrame(data).astype(INVENTORY_ARROW_DTYPES)
     return pd.DataFrame(data)
 
 
@@ -11,6 +11,7 @@ from data_scientist import (
     generate_sample_inventory_data
 )
 import pandas as pd
+import matplotlib.pyplot as plt
 
 
 def main():
@@ -43,7 +44,8 @@ def main():
         sales_data,
         product_column='Product',
         sales_column='Sales',
-        save_chart='corporate_sales_pareto.png'
+        save_chart='corporate_sales_pareto.png',
+        reuse_figure=True
     )
     
     print(f"\n📊 KEY INSIGHTS:")
@@ -73,9 +75,10 @@ def main():
         row_dimension='Region',
         column_dimension='Quarter',
         value_metric='Sales',
-        aggfunc='sum'
+        aggfunc='sum',
+        round_to=2
     )
-    print(regional_quarterly_pivot.round(2))
+    print(regional_quarterly_pivot)
     
     # Analysis 2: Average transaction value by Product and Region
     print("\n📊 PIVOT TABLE 2: Average Transaction Value by Product and Region")
@@ -87,9 +90,10 @@ def main():
         values='Sales',
         aggfunc='mean',
         margins=True,
-        margins_name='Overall Avg'
+        margins_name='Overall Avg',
+        round_to=2
     )
-    print(avg_transaction_pivot.round(2))
+    print(avg_transaction_pivot)
     
     # Analysis 3: Quantity sold by Product and Quarter
     print("\n📊 PIVOT TABLE 3: Quantity Sold by Product and Quarter")
@@ -123,9 +127,13 @@ def main():
         inventory_data,
         item_column='Item',
         turnover_column='Turnover',
-        save_chart='inventory_turnover_pareto.png'
+        save_chart='inventory_turnover_pareto.png',
+        reuse_figure=True
     )
     
+    # Both charts were drawn into the same shared figure; release it now
+    plt.close(inventory_analysis['figure'])
+    
     print(f"\n📦 INVENTORY INSIGHTS:")
     print(f"   • Total SKUs: {inventory_analysis['total_items']}")
     print(f"   • Fast-moving items (80% turnover): {inventory_analysis['fast_moving_items_count']}")
@@ -5,6 +5,8 @@ This guide shows you how to get started with the Ethos Data Science tool
 in under 5 minutes.
 """
 
+import numpy as np
+
 from data_scientist import DataScientist, generate_sample_sales_data, generate_sample_inventory_data
 
 def quick_start_guide():
@@ -44,7 +46,8 @@ def quick_start_guide():
         show_plot=False
     )
     
-    top_80 = pareto_result[pareto_result['Cumulative_Percentage'] <= 80]
+    cutoff = int(np.searchsorted(pareto_result['Cumulative_Percentage'].to_numpy(), 80.0, side='right'))
+    top_80 = pareto_result.iloc[:cutoff]
     
     print(f"✓ Chart saved as 'quick_start_pareto.png'")
     print(f"✓ {len(top_80)} out of {len(pareto_result)} products drive 80% of sales")
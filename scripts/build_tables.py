@@ -4,17 +4,90 @@ from __future__ import annotations
 import csv
 import datetime as dt
 import re
+import sys
 import zipfile
-import xml.etree.ElementTree as ET
-from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+try:
+    from lxml import etree as ET
+except ImportError:  # optional; libxml2 speeds up the built-in XML reader
+    import xml.etree.ElementTree as ET
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # optional Rust-backed reader
+    CalamineWorkbook = None
+
+try:
+    import openpyxl
+except ImportError:  # optional; the built-in XML reader is the last resort
+    openpyxl = None
 
 
 WORKBOOK_PATH = Path("Cust Charting LT.xlsx")
 OUTPUT_DIR = Path("outputs")
 
+# (sheet name, worksheet part inside the xlsx archive)
+SALES_SHEET = ("Sales Pivot Data Fields", "xl/worksheets/sheet1.xml")
+INVENTORY_SHEET = ("Inventory_ALL", "xl/worksheets/sheet2.xml")
+
+# The only columns main() reads; everything else is skipped while parsing
+SALES_COLUMNS = (
+    "Order Creation Date",
+    "Revenue (£££)",
+    "Sales Order Number",
+    "(As Sold Cost) $",
+    "Site",
+    "Part Number",
+    "Customer Name",
+    "Saleforce Oppurtunity",
+    "Qty Shipped",
+)
+INVENTORY_COLUMNS = ("Site", "Part No", "Onhand Qty")
+
+EXCEL_EPOCH = dt.datetime(1899, 12, 30)
+SERIAL_DATE_RE = re.compile(r"^-?\d+(\.\d+)?$")
+# Serials whose offset and date both fit in nanosecond timedeltas/timestamps
+SERIAL_DAY_LIMITS = (
+    max((pd.Timestamp.min - EXCEL_EPOCH).days, -pd.Timedelta.max.days) + 1,
+    min((pd.Timestamp.max - EXCEL_EPOCH).days, pd.Timedelta.max.days) - 1,
+)
+
 NS = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+SHEET_DATA_TAG = f"{{{NS['main']}}}sheetData"
+ROW_TAG = f"{{{NS['main']}}}row"
+CELL_TAG = f"{{{NS['main']}}}c"
+VALUE_TAG = f"{{{NS['main']}}}v"
+INLINE_STRING_TAG = f"{{{NS['main']}}}is"
+STRING_ITEM_TAG = f"{{{NS['main']}}}si"
+TEXT_TAG = f"{{{NS['main']}}}t"
+
+# lxml can filter iterparse events by tag in C and lift its size limits
+if hasattr(ET, "LXML_VERSION"):
+    XML_PARSER = ET.XMLParser(huge_tree=True)
+    ITERPARSE_OPTIONS: Dict[str, Any] = {"tag": (SHEET_DATA_TAG, ROW_TAG), "huge_tree": True}
+else:
+    XML_PARSER = None
+    ITERPARSE_OPTIONS = {}
+
+# Column letters -> zero-based index, filled lazily by parse_sheet
+COLUMN_INDEXES: Dict[str, int] = {}
 
 
 def col_to_idx(col: str) -> int:
@@ -27,44 +100,133 @@ def col_to_idx(col: str) -> int:
 def parse_shared_strings(zfile: zipfile.ZipFile) -> List[str]:
     if "xl/sharedStrings.xml" not in zfile.namelist():
         return []
-    root = ET.fromstring(zfile.read("xl/sharedStrings.xml"))
+    root = ET.fromstring(zfile.read("xl/sharedStrings.xml"), XML_PARSER)
     strings = []
-    for si in root.findall("main:si", NS):
-        strings.append("".join(t.text or "" for t in si.findall(".//main:t", NS)))
+    for si in root.iterfind(STRING_ITEM_TAG):
+        strings.append(sys.intern("".join(t.text or "" for t in si.iter(TEXT_TAG))))
     return strings
 
 
-def parse_sheet(zfile: zipfile.ZipFile, sheet_path: str) -> List[List[Optional[str]]]:
-    shared_strings = parse_shared_strings(zfile)
-    root = ET.fromstring(zfile.read(sheet_path))
-    rows: List[List[Optional[str]]] = []
-    for row in root.findall("main:sheetData/main:row", NS):
-        row_values: Dict[int, Optional[str]] = {}
-        max_col = -1
-        for cell in row.findall("main:c", NS):
-            cell_ref = cell.attrib.get("r")
-            if not cell_ref:
+def parse_sheet(
+    zfile: zipfile.ZipFile,
+    sheet_path: str,
+    shared_strings: List[str],
+    needed: Optional[Collection[str]] = None,
+) -> Iterator[List[Optional[str]]]:
+    """Stream the rows of a worksheet, freeing each <row> once it is yielded.
+
+    With ``needed``, cells below the header row are only decoded for the
+    columns whose header is listed; the rest are left as None.
+    """
+    sheet_data = None
+    keep: Optional[Set[int]] = None
+    with zfile.open(sheet_path) as stream:
+        for event, elem in ET.iterparse(stream, events=("start", "end"), **ITERPARSE_OPTIONS):
+            if event == "start":
+                if elem.tag == SHEET_DATA_TAG:
+                    sheet_data = elem
+                continue
+            if elem.tag != ROW_TAG:
                 continue
-            col_letters = re.match(r"[A-Z]+", cell_ref).group(0)
-            col_idx = col_to_idx(col_letters)
-            max_col = max(max_col, col_idx)
-            cell_type = cell.attrib.get("t")
-            value = None
-            v = cell.find("main:v", NS)
-            if cell_type == "s":
-                if v is not None and v.text is not None:
-                    value = shared_strings[int(v.text)]
-            elif cell_type == "inlineStr":
-                is_elem = cell.find("main:is", NS)
-                if is_elem is not None:
-                    value = "".join(t.text or "" for t in is_elem.findall(".//main:t", NS))
-            else:
-                if v is not None:
-                    value = v.text
-            row_values[col_idx] = value
-        if row_values:
-            rows.append([row_values.get(i) for i in range(max_col + 1)])
-    return rows
+            values: List[Optional[str]] = []
+            for cell in elem.iterfind(CELL_TAG):
+                cell_ref = cell.attrib.get("r")
+                if not cell_ref:
+                    continue
+                i = 0
+                while i < len(cell_ref) and not cell_ref[i].isdigit():
+                    i += 1
+                col_letters = cell_ref[:i]
+                col_idx = COLUMN_INDEXES.get(col_letters)
+                if col_idx is None:
+                    col_idx = COLUMN_INDEXES[col_letters] = col_to_idx(col_letters)
+                if keep is not None and col_idx not in keep:
+                    continue
+                cell_type = cell.attrib.get("t")
+                value = None
+                v = cell.find(VALUE_TAG)
+                if cell_type == "s":
+                    if v is not None and v.text is not None:
+                        value = shared_strings[int(v.text)]
+                elif cell_type == "inlineStr":
+                    is_elem = cell.find(INLINE_STRING_TAG)
+                    if is_elem is not None:
+                        value = "".join(t.text or "" for t in is_elem.iter(TEXT_TAG))
+                else:
+                    if v is not None:
+                        value = v.text
+                # Cells arrive in column order; pad the gaps left by empty cells
+                if col_idx >= len(values):
+                    values.extend([None] * (col_idx - len(values)))
+                    values.append(value)
+                else:
+                    values[col_idx] = value
+            # Drop processed rows so memory stays proportional to one row
+            if sheet_data is not None:
+                sheet_data.clear()
+            if values:
+                if needed is not None and keep is None:
+                    keep = {
+                        idx
+                        for idx, header in enumerate(values)
+                        if normalize_header(header) in needed
+                    }
+                yield values
+
+
+def cell_text(value: Any) -> Optional[str]:
+    """Render a typed cell value the way the sheet XML stores it."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, dt.date):
+        if not isinstance(value, dt.datetime):
+            value = dt.datetime.combine(value, dt.time())
+        value = (value - EXCEL_EPOCH) / dt.timedelta(days=1)
+    elif isinstance(value, dt.time):
+        value = (dt.datetime.combine(EXCEL_EPOCH, value) - EXCEL_EPOCH) / dt.timedelta(days=1)
+    elif isinstance(value, dt.timedelta):
+        value = value / dt.timedelta(days=1)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_workbook_records(
+    sheets: Sequence[Tuple[str, str]], columns: Sequence[Collection[str]]
+) -> List[Dict[str, List[Optional[str]]]]:
+    """Read each (sheet name, sheet path) as header-keyed columns of cell text.
+
+    Only the headers listed in the matching entry of ``columns`` are kept.
+    Uses python-calamine or openpyxl when installed and falls back to the
+    built-in streaming XML reader otherwise.
+    """
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(str(WORKBOOK_PATH))
+        typed = [workbook.get_sheet_by_name(name).to_python() for name, _ in sheets]
+    elif openpyxl is not None:
+        workbook = openpyxl.load_workbook(WORKBOOK_PATH, read_only=True, data_only=True)
+        try:
+            typed = [list(workbook[name].iter_rows(values_only=True)) for name, _ in sheets]
+        finally:
+            workbook.close()
+    else:
+        with zipfile.ZipFile(WORKBOOK_PATH) as zfile:
+            shared_strings = parse_shared_strings(zfile)
+            return [
+                rows_to_columns(parse_sheet(zfile, path, shared_strings, needed), needed)
+                for (_, path), needed in zip(sheets, columns)
+            ]
+
+    result = []
+    for rows, needed in zip(typed, columns):
+        # Skip blank rows before converting anything, as cell_text would
+        non_blank = (row for row in rows if any(v is not None and v != "" for v in row))
+        result.append(rows_to_columns(non_blank, needed, convert=cell_text))
+    return result
 
 
 def normalize_header(value: Optional[str]) -> str:
@@ -73,17 +235,31 @@ def normalize_header(value: Optional[str]) -> str:
     return " ".join(value.split())
 
 
-def rows_to_dicts(rows: List[List[Optional[str]]]) -> List[Dict[str, Optional[str]]]:
-    headers = [normalize_header(h) for h in rows[0]]
-    data_rows = []
-    for row in rows[1:]:
-        row_dict = {}
-        for idx, header in enumerate(headers):
-            if not header:
-                continue
-            row_dict[header] = row[idx] if idx < len(row) else None
-        data_rows.append(row_dict)
-    return data_rows
+def rows_to_columns(
+    rows: Iterable[Sequence[Any]],
+    needed: Optional[Collection[str]] = None,
+    convert: Optional[Callable[[Any], Optional[str]]] = None,
+) -> Dict[str, List[Optional[str]]]:
+    """Transpose data rows into one value list per header, padding short rows.
+
+    Only headers in ``needed`` are kept (all of them when it is None), and
+    ``convert`` is applied to the header row and to the kept cells.
+    """
+    rows = iter(rows)
+    header_row = next(rows)
+    if convert is not None:
+        header_row = [convert(h) for h in header_row]
+    headers = [sys.intern(normalize_header(h)) for h in header_row]
+    data_rows = list(rows)
+    columns: Dict[str, List[Optional[str]]] = {}
+    for idx, header in enumerate(headers):
+        if not header or (needed is not None and header not in needed):
+            continue
+        values = [row[idx] if idx < len(row) else None for row in data_rows]
+        if convert is not None:
+            values = [convert(value) for value in values]
+        columns[header] = values
+    return columns
 
 
 def to_float(value: Optional[str]) -> float:
@@ -112,11 +288,10 @@ def parse_date(value: Optional[str]) -> Optional[dt.date]:
             return None
         try:
             # Excel serialized date
-            if re.match(r"^-?\d+(\.\d+)?$", cleaned):
+            if SERIAL_DATE_RE.match(cleaned):
                 serial = float(cleaned)
-                base = dt.datetime(1899, 12, 30)
-                return (base + dt.timedelta(days=serial)).date()
-        except ValueError:
+                return (EXCEL_EPOCH + dt.timedelta(days=serial)).date()
+        except (ValueError, OverflowError):
             pass
         for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d"):
             try:
@@ -128,11 +303,43 @@ def parse_date(value: Optional[str]) -> Optional[dt.date]:
         except ValueError:
             return None
     if isinstance(value, (int, float)):
-        base = dt.datetime(1899, 12, 30)
-        return (base + dt.timedelta(days=float(value))).date()
+        return (EXCEL_EPOCH + dt.timedelta(days=float(value))).date()
     return None
 
 
+def to_float_column(values: pd.Series) -> pd.Series:
+    """Vectorized ``to_float``; cells pandas cannot parse fall back to the scalar path."""
+    cleaned = values.fillna("").astype(str).str.replace(",", "", regex=False).str.strip()
+    numbers = pd.to_numeric(cleaned, errors="coerce").astype("float64")
+    leftover = numbers.isna() & (cleaned != "")
+    if leftover.any():
+        numbers[leftover] = values[leftover].map(to_float)
+    numbers[cleaned == ""] = 0.0
+    return numbers
+
+
+def parse_year_column(values: pd.Series) -> pd.Series:
+    """Vectorized ``parse_date(...).year``, NaN where a cell has no date.
+
+    Excel serials are converted in bulk; serials outside pandas' nanosecond
+    range (years 1677-2262 on pandas 2) and the odd text date go through
+    ``parse_date`` once per distinct value.
+    """
+    cleaned = values.fillna("").astype(str).str.strip()
+    serials = pd.to_numeric(cleaned.where(cleaned.str.match(SERIAL_DATE_RE.pattern)), errors="coerce")
+    in_bounds = serials.between(*SERIAL_DAY_LIMITS)
+    offsets = pd.to_timedelta(serials.where(in_bounds), unit="D").dt.round("us")
+    years = (pd.Timestamp(EXCEL_EPOCH) + offsets).dt.year.astype("float64")
+    leftover = ~in_bounds & (cleaned != "")
+    if leftover.any():
+        parsed = {}
+        for value in cleaned[leftover].unique():
+            date = parse_date(value)
+            parsed[value] = np.nan if date is None else date.year
+        years[leftover] = cleaned[leftover].map(parsed)
+    return years
+
+
 def classify_customer(customer_name: Optional[str]) -> str:
     if customer_name and "ethos" in customer_name.lower():
         return "Internal"
@@ -141,133 +348,207 @@ def classify_customer(customer_name: Optional[str]) -> str:
 
 def write_csv(path: Path, headers: Iterable[str], rows: Iterable[Iterable[Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="\n", encoding="utf-8") as handle:
+    with path.open("w", newline="\n", encoding="utf-8", buffering=1 << 20) as handle:
         writer = csv.writer(handle, lineterminator="\n")
         writer.writerow(list(headers))
-        for row in rows:
-            writer.writerow(list(row))
+        writer.writerows(rows)
+
+
+def text_column(frame: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped text values of a column, with missing cells as ""."""
+    return frame[column].fillna("").astype(str).str.strip()
+
+
+def group_sums_kernel(codes: np.ndarray, weights: np.ndarray, totals: np.ndarray) -> None:
+    """Add every weight column into its group's row of ``totals`` in one pass."""
+    for i in range(codes.shape[0]):
+        group = codes[i]
+        for j in range(weights.shape[1]):
+            totals[group, j] += weights[i, j]
+
+
+_COMPILED_GROUP_SUMS = None
+
+
+def get_group_sums_kernel():
+    """Import Numba on first use and return the compiled kernel, or None."""
+    global _COMPILED_GROUP_SUMS
+    if _COMPILED_GROUP_SUMS is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _COMPILED_GROUP_SUMS = False
+        else:
+            _COMPILED_GROUP_SUMS = njit(cache=True)(group_sums_kernel)
+    return _COMPILED_GROUP_SUMS or None
+
+
+def aggregate_groups(
+    frame: pd.DataFrame,
+    keys: List[str],
+    sums: Sequence[str] = (),
+    distinct: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Per-group sums and distinct counts over a single set of group codes.
+
+    Sums are accumulated in row order, by the Numba kernel when available and
+    np.bincount otherwise: pandas' groupby ``sum`` is compensated, which moves
+    totals that sit on a rounding boundary.
+    """
+    grouped = frame.groupby(keys, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    table = pd.DataFrame(index=grouped.size().index)
+    if sums:
+        weights = frame[list(sums)].to_numpy(float)
+        kernel = get_group_sums_kernel()
+        if kernel is not None:
+            totals = np.zeros((len(table), len(sums)))
+            kernel(codes, weights, totals)
+        else:
+            totals = np.column_stack(
+                [
+                    np.bincount(codes, weights=weights[:, j], minlength=len(table))
+                    for j in range(len(sums))
+                ]
+            )
+        for j, column in enumerate(sums):
+            table[column] = totals[:, j]
+    for column in distinct:
+        # Count each (group, value) pair once; nulls (code -1) are not counted
+        value_codes, values = pd.factorize(frame[column])
+        present = value_codes >= 0
+        pairs = np.unique(codes[present].astype(np.int64) * len(values) + value_codes[present])
+        table[column] = np.bincount(pairs // max(len(values), 1), minlength=len(table))
+    return table
 
 
 def main() -> None:
     if not WORKBOOK_PATH.exists():
         raise SystemExit(f"Workbook not found: {WORKBOOK_PATH}")
 
-    with zipfile.ZipFile(WORKBOOK_PATH) as zfile:
-        sales_rows = parse_sheet(zfile, "xl/worksheets/sheet1.xml")
-        inventory_rows = parse_sheet(zfile, "xl/worksheets/sheet2.xml")
-
-    sales = rows_to_dicts(sales_rows)
-    inventory = rows_to_dicts(inventory_rows)
-
-    inventory_totals: Dict[Tuple[str, str], float] = defaultdict(float)
-    for row in inventory:
-        site = (row.get("Site") or "").strip()
-        part_no = (row.get("Part No") or "").strip()
-        onhand_qty = to_float(row.get("Onhand Qty"))
-        if site and part_no:
-            inventory_totals[(site, part_no)] += onhand_qty
+    sales, inventory = read_workbook_records(
+        [SALES_SHEET, INVENTORY_SHEET], [SALES_COLUMNS, INVENTORY_COLUMNS]
+    )
 
-    inventory_output_rows = [
-        (site, part, qty)
-        for (site, part), qty in sorted(inventory_totals.items())
+    inventory_df = pd.DataFrame(inventory).reindex(columns=list(INVENTORY_COLUMNS))
+    inventory_df = pd.DataFrame(
+        {
+            "site": text_column(inventory_df, "Site"),
+            "part_no": text_column(inventory_df, "Part No"),
+            "onhand_qty": to_float_column(inventory_df["Onhand Qty"]),
+        }
+    )
+    inventory_df = inventory_df[(inventory_df["site"] != "") & (inventory_df["part_no"] != "")]
+    inventory_totals = aggregate_groups(inventory_df, ["site", "part_no"], ["onhand_qty"])[
+        "onhand_qty"
     ]
+
     write_csv(
         OUTPUT_DIR / "Inventory_Normalized.csv",
         ["Site", "Part No", "Onhand Qty"],
-        inventory_output_rows,
+        inventory_totals.reset_index().itertuples(index=False, name=None),
     )
 
-    sales_filtered = []
-    order_revenue: Dict[str, float] = defaultdict(float)
-    order_cost: Dict[str, float] = {}
-    for row in sales:
-        date_value = parse_date(row.get("Order Creation Date"))
-        year = date_value.year if date_value else None
-        if year is None or year < 2019 or year > 2025:
-            continue
-        revenue_gbp = to_float(row.get("Revenue (£££)"))
-        order_number = (row.get("Sales Order Number") or "").strip()
-        if order_number:
-            order_revenue[order_number] += revenue_gbp
-            cost_value = to_float(row.get("(As Sold Cost) $") or 0)
-            if cost_value and order_number not in order_cost:
-                order_cost[order_number] = cost_value
-        row["_parsed_year"] = year
-        row["_revenue_gbp"] = revenue_gbp
-        sales_filtered.append(row)
-
-    for row in sales_filtered:
-        order_number = (row.get("Sales Order Number") or "").strip()
-        revenue_gbp = row.get("_revenue_gbp", 0.0)
-        total_revenue = order_revenue.get(order_number, 0.0)
-        cost_total = order_cost.get(order_number, 0.0)
-        cost_alloc = 0.0
-        if total_revenue > 0:
-            cost_alloc = cost_total * (revenue_gbp / total_revenue)
-        row["_cost_alloc_usd"] = cost_alloc
-
-    part_groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
-    for row in sales_filtered:
-        site = (row.get("Site") or "").strip()
-        part_no = (row.get("Part Number") or "").strip()
-        if not site or not part_no:
-            continue
-        key = (site, part_no)
-        group = part_groups.setdefault(
-            key,
-            {
-                "revenue_gbp": 0.0,
-                "units": 0.0,
-                "customers": set(),
-                "internal_revenue_gbp": 0.0,
-                "external_revenue_gbp": 0.0,
-                "internal_units": 0.0,
-                "external_units": 0.0,
-                "internal_customers": set(),
-                "external_customers": set(),
-                "cost_alloc_usd": 0.0,
-            },
-        )
-        revenue_gbp = float(row.get("_revenue_gbp", 0.0))
-        qty = to_float(row.get("Qty Shipped"))
-        customer_name = (row.get("Customer Name") or "").strip()
-        customer_type = classify_customer(customer_name)
-        group["revenue_gbp"] += revenue_gbp
-        group["units"] += qty
-        group["customers"].add(customer_name)
-        group["cost_alloc_usd"] += float(row.get("_cost_alloc_usd", 0.0))
-        if customer_type == "Internal":
-            group["internal_revenue_gbp"] += revenue_gbp
-            group["internal_units"] += qty
-            group["internal_customers"].add(customer_name)
-        else:
-            group["external_revenue_gbp"] += revenue_gbp
-            group["external_units"] += qty
-            group["external_customers"].add(customer_name)
-
-    part_rows = []
-    for (site, part_no), group in sorted(part_groups.items()):
-        onhand_qty = inventory_totals.get((site, part_no), 0.0)
-        part_rows.append(
-            (
-                site,
-                part_no,
-                round(group["revenue_gbp"], 2),
-                round(group["units"], 2),
-                len(group["customers"]),
-                round(group["internal_revenue_gbp"], 2),
-                round(group["external_revenue_gbp"], 2),
-                round(group["internal_units"], 2),
-                round(group["external_units"], 2),
-                len(group["internal_customers"]),
-                len(group["external_customers"]),
-                round(onhand_qty, 2),
-                round(group["cost_alloc_usd"], 2),
-                "",
-                "",
-            )
+    sales_df = pd.DataFrame(sales).reindex(columns=list(SALES_COLUMNS))
+    years = parse_year_column(sales_df["Order Creation Date"])
+    in_range = years.between(2019, 2025)
+    sales_df = sales_df[in_range]
+
+    tx = pd.DataFrame(
+        {
+            "site": text_column(sales_df, "Site"),
+            "part_no": text_column(sales_df, "Part Number"),
+            "customer": text_column(sales_df, "Customer Name"),
+            "order": text_column(sales_df, "Sales Order Number"),
+            "opportunity": text_column(sales_df, "Saleforce Oppurtunity").replace("", None),
+            "year": years[in_range].astype(int),
+            "revenue": to_float_column(sales_df["Revenue (£££)"]),
+            "qty": to_float_column(sales_df["Qty Shipped"]),
+            "cost": to_float_column(sales_df["(As Sold Cost) $"]),
+        }
+    )
+    # Blank-key masks, shared by the three tables below
+    has_site = tx["site"] != ""
+    site_part = has_site & (tx["part_no"] != "")
+    site_customer = has_site & (tx["customer"] != "")
+
+    # Key columns become categoricals: grouping then works on their int codes
+    for key in ("site", "part_no", "customer"):
+        tx[key] = tx[key].astype("category")
+
+    # Classify each distinct customer once rather than once per sales line
+    customer_codes, customer_names = pd.factorize(tx["customer"])
+    customer_types = {name: classify_customer(name) for name in customer_names}
+    is_internal = np.array(
+        [customer_types[name] == "Internal" for name in customer_names], dtype=bool
+    )
+    tx["internal"] = is_internal[customer_codes]
+
+    # Allocate each order's first non-zero cost across its lines by revenue share
+    order_codes, orders = pd.factorize(tx["order"].where(tx["order"] != ""))
+    revenue = tx["revenue"].to_numpy()
+    cost = tx["cost"].to_numpy()
+    has_order = order_codes >= 0
+    order_revenue = np.bincount(
+        order_codes[has_order], weights=revenue[has_order], minlength=len(orders)
+    )
+    costed = np.flatnonzero(has_order & (cost != 0))
+    costed_orders, first = np.unique(order_codes[costed], return_index=True)
+    order_cost = np.zeros(len(orders))
+    order_cost[costed_orders] = cost[costed[first]]
+    # A trailing zero slot picks up the -1 code of lines without an order
+    line_revenue = np.append(order_revenue, 0.0)[order_codes]
+    line_cost = np.append(order_cost, 0.0)[order_codes]
+    allocated = line_revenue > 0
+    cost_alloc = np.zeros(len(tx))
+    cost_alloc[allocated] = line_cost[allocated] * (revenue[allocated] / line_revenue[allocated])
+    tx["cost_alloc"] = cost_alloc
+    tx["internal_customer"] = tx["customer"].where(tx["internal"])
+    tx["external_customer"] = tx["customer"].mask(tx["internal"])
+
+    parts = tx[site_part]
+    parts = parts.assign(
+        internal_revenue=parts["revenue"].where(parts["internal"], 0.0),
+        external_revenue=parts["revenue"].mask(parts["internal"], 0.0),
+        internal_units=parts["qty"].where(parts["internal"], 0.0),
+        external_units=parts["qty"].mask(parts["internal"], 0.0),
+    )
+    part_groups = aggregate_groups(
+        parts,
+        ["site", "part_no"],
+        sums=[
+            "revenue",
+            "qty",
+            "internal_revenue",
+            "external_revenue",
+            "internal_units",
+            "external_units",
+            "cost_alloc",
+        ],
+        distinct=["customer", "internal_customer", "external_customer"],
+    )
+    part_groups["onhand_qty"] = inventory_totals.reindex(part_groups.index, fill_value=0.0)
+
+    part_rows = (
+        (
+            site,
+            part_no,
+            f"{group.revenue:.2f}",
+            f"{group.qty:.2f}",
+            group.customer,
+            f"{group.internal_revenue:.2f}",
+            f"{group.external_revenue:.2f}",
+            f"{group.internal_units:.2f}",
+            f"{group.external_units:.2f}",
+            group.internal_customer,
+            group.external_customer,
+            f"{group.onhand_qty:.2f}",
+            f"{group.cost_alloc:.2f}",
+            "",
+            "",
         )
-
+        for (site, part_no), group in zip(part_groups.index, part_groups.itertuples(index=False))
+    )
     write_csv(
         OUTPUT_DIR / "part_level_pareto.csv",
         [
@@ -290,46 +571,30 @@ def main() -> None:
         part_rows,
     )
 
-    customer_groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
-    for row in sales_filtered:
-        site = (row.get("Site") or "").strip()
-        customer_name = (row.get("Customer Name") or "").strip()
-        if not site or not customer_name:
-            continue
-        key = (site, customer_name)
-        group = customer_groups.setdefault(
-            key,
-            {
-                "revenue_gbp": 0.0,
-                "units": 0.0,
-                "opportunities": set(),
-                "cost_alloc_usd": 0.0,
-            },
+    customers = tx[site_customer]
+    customer_groups = aggregate_groups(
+        customers,
+        ["site", "customer"],
+        sums=["revenue", "qty", "cost_alloc"],
+        distinct=["opportunity"],
+    )
+
+    customer_rows = (
+        (
+            site,
+            customer_name,
+            customer_types[customer_name],
+            f"{group.revenue:.2f}",
+            f"{group.qty:.2f}",
+            group.opportunity,
+            f"{group.cost_alloc:.2f}",
+            "",
+            "",
         )
-        revenue_gbp = float(row.get("_revenue_gbp", 0.0))
-        group["revenue_gbp"] += revenue_gbp
-        group["units"] += to_float(row.get("Qty Shipped"))
-        opportunity = (row.get("Saleforce Oppurtunity") or "").strip()
-        if opportunity:
-            group["opportunities"].add(opportunity)
-        group["cost_alloc_usd"] += float(row.get("_cost_alloc_usd", 0.0))
-
-    customer_rows = []
-    for (site, customer_name), group in sorted(customer_groups.items()):
-        customer_type = classify_customer(customer_name)
-        customer_rows.append(
-            (
-                site,
-                customer_name,
-                customer_type,
-                round(group["revenue_gbp"], 2),
-                round(group["units"], 2),
-                len(group["opportunities"]),
-                round(group["cost_alloc_usd"], 2),
-                "",
-                "",
-            )
+        for (site, customer_name), group in zip(
+            customer_groups.index, customer_groups.itertuples(index=False)
         )
+    )
 
     write_csv(
         OUTPUT_DIR / "customer_level_pareto.csv",
@@ -347,42 +612,12 @@ def main() -> None:
         customer_rows,
     )
 
-    customer_counts: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
-    for row in sales_filtered:
-        site = (row.get("Site") or "").strip()
-        part_no = (row.get("Part Number") or "").strip()
-        year = row.get("_parsed_year")
-        customer_name = (row.get("Customer Name") or "").strip()
-        if not site or not part_no or not year or not customer_name:
-            continue
-        key = (site, int(year), part_no)
-        group = customer_counts.setdefault(
-            key,
-            {
-                "customers": set(),
-                "internal_customers": set(),
-                "external_customers": set(),
-            },
-        )
-        group["customers"].add(customer_name)
-        customer_type = classify_customer(customer_name)
-        if customer_type == "Internal":
-            group["internal_customers"].add(customer_name)
-        else:
-            group["external_customers"].add(customer_name)
-
-    count_rows = []
-    for (site, year, part_no), group in sorted(customer_counts.items()):
-        count_rows.append(
-            (
-                site,
-                year,
-                part_no,
-                len(group["customers"]),
-                len(group["internal_customers"]),
-                len(group["external_customers"]),
-            )
-        )
+    counted = tx[site_part & site_customer]
+    customer_counts = aggregate_groups(
+        counted,
+        ["site", "year", "part_no"],
+        distinct=["customer", "internal_customer", "external_customer"],
+    )
 
     write_csv(
         OUTPUT_DIR / "customer_counts_by_site_year_part.csv",
@@ -394,7 +629,7 @@ def main() -> None:
             "Internal_Customer_Count",
             "External_Customer_Count",
         ],
-        count_rows,
+        customer_counts.reset_index().itertuples(index=False, name=None),
     )
 
 
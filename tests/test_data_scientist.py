@@ -0,0 +1,218 @@
+"""
+Regression checks for DataScientist.
+
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import data_scientist
+from data_scientist import DataScientist
+
+
+@unittest.skipIf(data_scientist.pl is None, "Polars is not installed")
+class PolarsPivotTest(unittest.TestCase):
+    """The Polars column_values pivot must agree with pd.pivot_table."""
+
+    def setUp(self):
+        self.ds = DataScientist()
+        # ('y', 'b') has no rows, and 'c' is requested but absent from the data
+        self.data = pd.DataFrame({
+            'Region': ['x', 'x', 'y', 'y'],
+            'Product': ['a', 'b', 'a', 'a'],
+            'Sales': [1.0, 2.0, 3.0, 4.0],
+        })
+
+    def assert_matches_pandas(self, aggfunc, column_values=('a', 'b', 'c'), **options):
+        result = self.ds.create_pivot_table(
+            self.data, index='Region', columns='Product', values='Sales',
+            aggfunc=aggfunc, column_values=list(column_values), **options
+        )
+        expected = pd.pivot_table(
+            self.data, index='Region', columns='Product', values='Sales',
+            aggfunc=aggfunc, **options
+        )
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(list(result.index), list(expected.index))
+        np.testing.assert_allclose(
+            result.to_numpy(dtype=float), expected.to_numpy(dtype=float)
+        )
+
+    def test_missing_cells(self):
+        for aggfunc in ('sum', 'count', 'mean'):
+            with self.subTest(aggfunc=aggfunc):
+                self.assert_matches_pandas(aggfunc)
+
+    def test_fill_value(self):
+        for aggfunc in ('sum', 'count', 'mean'):
+            with self.subTest(aggfunc=aggfunc):
+                self.assert_matches_pandas(aggfunc, fill_value=-1)
+
+    def test_margins(self):
+        for aggfunc in ('sum', 'count', 'mean'):
+            with self.subTest(aggfunc=aggfunc):
+                self.assert_matches_pandas(aggfunc, margins=True, margins_name='Total')
+
+    def test_null_keys(self):
+        # Rows with a missing index or column key are dropped, as in pandas
+        self.data = pd.DataFrame({
+            'Region': ['x', 'y', None, 'x', 'y'],
+            'Product': ['a', 'b', 'a', 'a', None],
+            'Sales': [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        for aggfunc in ('sum', 'count', 'mean'):
+            with self.subTest(aggfunc=aggfunc):
+                self.assert_matches_pandas(
+                    aggfunc, column_values=['a', 'b'], margins=True, margins_name='Total'
+                )
+
+    def test_bool_columns(self):
+        self.data = pd.DataFrame({
+            'Region': ['x', 'y', 'x', 'y'],
+            'Product': [True, False, True, True],
+            'Sales': [1.0, 2.0, 3.0, 4.0],
+        })
+        for aggfunc in ('sum', 'count', 'mean'):
+            with self.subTest(aggfunc=aggfunc):
+                self.assert_matches_pandas(
+                    aggfunc, column_values=[False, True], margins=True, margins_name='Total'
+                )
+
+    def test_polars_input_with_null_columns(self):
+        # Without column_values, the pivot columns come from the data's
+        # non-null values
+        self.data = pd.DataFrame({
+            'Region': ['x', 'y', 'x', 'y'],
+            'Product': ['a', None, 'b', 'a'],
+            'Sales': [1.0, 2.0, 3.0, 4.0],
+        })
+        expected = pd.pivot_table(
+            self.data, index='Region', columns='Product', values='Sales', aggfunc='sum'
+        )
+        polars_data = data_scientist.pl.from_pandas(self.data)
+        for frame in (polars_data, polars_data.lazy()):
+            with self.subTest(frame=type(frame).__name__):
+                result = self.ds.create_pivot_table(
+                    frame, index='Region', columns='Product', values='Sales'
+                )
+                self.assertEqual(list(result.columns), list(expected.columns))
+                np.testing.assert_allclose(
+                    result.to_numpy(dtype=float), expected.to_numpy(dtype=float)
+                )
+
+
+class PivotMarginsTest(unittest.TestCase):
+    """Margins derived from the cells keep pd.pivot_table's values and dtypes."""
+
+    def test_integer_values(self):
+        ds = DataScientist()
+        # ('y', 'b') has no rows, so the cells become float but totals stay int
+        full = pd.DataFrame({
+            'Region': ['x', 'x', 'y', 'y'],
+            'Product': ['a', 'b', 'a', 'b'],
+            'Quantity': [1, 2, 3, 4],
+        })
+        for data in (full, full.iloc[:3]):
+            for aggfunc in ('sum', 'count', 'mean'):
+                with self.subTest(rows=len(data), aggfunc=aggfunc):
+                    result = ds.create_pivot_table(
+                        data, index='Region', columns='Product', values='Quantity',
+                        aggfunc=aggfunc, margins=True, margins_name='Total'
+                    )
+                    expected = pd.pivot_table(
+                        data, index='Region', columns='Product', values='Quantity',
+                        aggfunc=aggfunc, margins=True, margins_name='Total'
+                    )
+                    pd.testing.assert_frame_equal(
+                        result, expected, check_index_type=False, check_column_type=False
+                    )
+
+
+@unittest.skipIf(data_scientist.pl is None, "Polars is not installed")
+class OldPolarsFallbackTest(unittest.TestCase):
+    """Without the lazy Polars API, Polars inputs go through pandas."""
+
+    def setUp(self):
+        self.ds = DataScientist()
+        self.data = pd.DataFrame({
+            'Region': ['x', 'x', 'y', 'y'],
+            'Product': ['a', 'b', 'a', 'a'],
+            'Sales': [1.0, 2.0, 3.0, 4.0],
+        })
+        self.saved = data_scientist.POLARS_LAZY_QUERIES
+        data_scientist.POLARS_LAZY_QUERIES = False
+
+    def tearDown(self):
+        data_scientist.POLARS_LAZY_QUERIES = self.saved
+
+    def test_pareto(self):
+        polars_data = data_scientist.pl.from_pandas(self.data).lazy()
+        result, _ = self.ds.create_pareto_chart(
+            polars_data, 'Product', 'Sales', show_plot=False, engine='polars'
+        )
+        expected, _ = self.ds.create_pareto_chart(self.data, 'Product', 'Sales', show_plot=False)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_pivot(self):
+        polars_data = data_scientist.pl.from_pandas(self.data)
+        result = self.ds.create_pivot_table(
+            polars_data, index='Region', columns='Product', values='Sales',
+            column_values=['a', 'b']
+        )
+        expected = pd.pivot_table(
+            self.data, index='Region', columns='Product', values='Sales', aggfunc='sum'
+        )
+        np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+
+class ParetoOrderTest(unittest.TestCase):
+    """Pareto categories are ranked by value for every numeric dtype."""
+
+    def test_unsigned_values(self):
+        ds = DataScientist()
+        for dtype in (np.uint32, np.uint64, np.int64, np.float64):
+            with self.subTest(dtype=dtype):
+                data = pd.DataFrame({
+                    'Product': ['x', 'y', 'w', 'z'],
+                    'Sales': np.array([5, 1, 3, 0], dtype=dtype),
+                })
+                result = ds.analyze_sales_by_product(data)
+                self.assertEqual(list(result['pareto_data']['Category']), ['x', 'w', 'y', 'z'])
+                self.assertEqual(result['products_contributing_80_percent'], 1)
+
+    def test_top_k_only_unsigned_values(self):
+        ds = DataScientist()
+        values = np.zeros(200, dtype=np.uint32)
+        values[[7, 42, 150]] = [50, 30, 20]
+        data = pd.DataFrame({'Product': [f'P{i}' for i in range(200)], 'Sales': values})
+        result, _ = ds.create_pareto_chart(
+            data, 'Product', 'Sales', show_plot=False, top_k_only=True
+        )
+        self.assertEqual(list(result['Category']), ['P7', 'P42', 'P150'])
+
+
+class ParetoPlotTest(unittest.TestCase):
+    """Long Pareto charts fold their tail into an "Other" bar."""
+
+    def test_other_bar_with_datetime_categories(self):
+        n = data_scientist.MAX_PARETO_BARS + 100
+        categories = np.arange('2020-01-01', n, dtype='datetime64[D]').astype('datetime64[ns]')
+        values = np.arange(n, 0, -1, dtype=float)
+        cumulative_percentage = np.cumsum(values) / values.sum() * 100
+        fig = DataScientist()._plot_pareto(
+            categories, values, cumulative_percentage, 'Sales', 'Pareto', None, False
+        )
+        try:
+            labels = [label.get_text() for label in fig.axes[0].get_xticklabels()]
+            self.assertLessEqual(len(labels), data_scientist.MAX_PARETO_BARS)
+            self.assertEqual(labels[-1], 'Other')
+        finally:
+            plt.close(fig)
+
+
+if __name__ == '__main__':
+    unittest.main()